@@ -1,3 +1,6 @@
+from functools import cached_property
+
+
 class DummyConnectionManager:
     def list_actions(self, connection_name):
         print(f"Available actions for connection '{connection_name}'")
@@ -8,20 +11,39 @@ class DummyConnectionManager:
     def list_connections(self):
         print("Available connections: example_connection")
 
+class DummyLLM:
+    def generate(self, prompt):
+        return f"LLM response to: {prompt}"
+
 class ZerePyAgent:
+    _ACTION_FMT = "Performed action '{action}' on connection '{connection}' with params {params}"
+
     def __init__(self, agent_name):
         self.name = agent_name
-        self.is_llm_set = True  # Set to False to test setup prompt
-        self.connection_manager = DummyConnectionManager()
+        self._llm = None
+
+    @property
+    def is_llm_set(self):
+        return self._llm is not None
+
+    @cached_property
+    def connection_manager(self):
+        return DummyConnectionManager()
 
     def perform_action(self, connection, action, params):
-        return f"Performed action '{action}' on connection '{connection}' with params {params}"
+        return self._ACTION_FMT.format(action=action, connection=connection, params=params)
 
     def loop(self):
         print("Running agent loop... (Ctrl+C to stop)")
 
     def _setup_llm_provider(self):
         print("Setting up LLM provider...")
+        self._llm = DummyLLM()
+
+    def _ensure_llm(self):
+        if self._llm is None:
+            self._setup_llm_provider()
+        return self._llm
 
     def prompt_llm(self, prompt):
-        return f"LLM response to: {prompt}"
+        return self._ensure_llm().generate(prompt)
@@ -1,65 +1,116 @@
 import sys
-import json
 import logging
 import os
-import shlex
-from dataclasses import dataclass
-from typing import Callable, Dict, List
+import heapq
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 from pathlib import Path
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit.styles import Style
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory
 from zerepy.agent import ZerePyAgent
 
+try:
+    from rapidfuzz import process
+    from rapidfuzz.distance import OSA
+except ImportError:
+    process = OSA = None
 
-def print_h_bar():
-    print("-" * 60)
+
+_HBAR = "-" * 60 + "\n"
+_WELCOME = _HBAR + "👋 Welcome to the ZerePy CLI!\nType 'help' to list commands.\n" + _HBAR
 
 
-logging.basicConfig(level=logging.INFO, format='%(message)s')
+def print_h_bar():
+    sys.stdout.write(_HBAR)
+
+
+def _tokenize(input_string: str) -> List[str]:
+    if '"' not in input_string and "'" not in input_string and "\\" not in input_string:
+        return input_string.split()
+    import shlex
+    return shlex.split(input_string)
+
+
+def _bounded_dl(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    two_ago, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], two_ago[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        two_ago, prev = prev, cur
+    return prev[-1]
+
+
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger("cli")
 
+_json_cache: Dict[Path, Tuple[int, dict]] = {}
+
 
-@dataclass
-class Command:
+def _read_json_cached(path: Path) -> dict:
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    import json
+    with open(path, "r") as f:
+        data = json.load(f)
+    _json_cache[path] = (mtime_ns, data)
+    return data
+
+
+class Command(NamedTuple):
     name: str
     description: str
-    tips: List[str]
+    tips: Tuple[str, ...]
     handler: Callable
-    aliases: List[str] = None
-
-    def __post_init__(self):
-        if self.aliases is None:
-            self.aliases = []
+    aliases: Tuple[str, ...] = ()
 
 
 class ZerePyCLI:
+    _COMMAND_SPECS: Tuple[Tuple[str, str, Tuple[str, ...], str, Tuple[str, ...]], ...] = (
+        ("help", "Show help", ("help", "help load-agent"), "help", ("h", "?")),
+        ("clear", "Clear the screen", ("clear",), "clear_screen", ("cls",)),
+        ("agent-action", "Run agent action", ("agent-action conn action",), "agent_action", ("action", "run")),
+        ("agent-loop", "Run agent loop", ("start",), "agent_loop", ("loop", "start")),
+        ("list-agents", "List agent files", (), "list_agents", ("agents", "ls-agents")),
+        ("load-agent", "Load an agent", ("load-agent agent_name",), "load_agent", ("load",)),
+        ("create-agent", "Create new agent", (), "create_agent", ("new-agent", "create")),
+        ("set-default-agent", "Set default agent", ("default agent_name",), "set_default_agent", ("default",)),
+        ("chat", "Chat with agent", (), "chat_session", ("talk",)),
+        ("list-actions", "List actions for connection", ("list-actions conn",), "list_actions", ("actions", "ls-actions")),
+        ("configure-connection", "Configure a connection", ("configure-connection conn",), "configure_connection", ("config", "setup")),
+        ("list-connections", "List all connections", (), "list_connections", ("connections", "ls-connections")),
+        ("exit", "Exit CLI", ("exit",), "exit", ("quit", "q")),
+    )
+
     def __init__(self):
         self.agent = None
         self.config_dir = Path.home() / '.zerepy'
         self.config_dir.mkdir(exist_ok=True)
+        self._agents_cache = (None, [])
+        self._prompt_cache: Dict[Optional[str], object] = {}
+        self._info = logger.info
         self._initialize_commands()
         self._setup_prompt_toolkit()
 
     def _initialize_commands(self):
         self.commands: Dict[str, Command] = {}
-        self._register_command(Command("help", "Show help", ["help", "help load-agent"], self.help, ["h", "?"]))
-        self._register_command(Command("clear", "Clear the screen", ["clear"], self.clear_screen, ["cls"]))
-        self._register_command(Command("agent-action", "Run agent action", ["agent-action conn action"], self.agent_action, ["action", "run"]))
-        self._register_command(Command("agent-loop", "Run agent loop", ["start"], self.agent_loop, ["loop", "start"]))
-        self._register_command(Command("list-agents", "List agent files", [], self.list_agents, ["agents", "ls-agents"]))
-        self._register_command(Command("load-agent", "Load an agent", ["load-agent agent_name"], self.load_agent, ["load"]))
-        self._register_command(Command("create-agent", "Create new agent", [], self.create_agent, ["new-agent", "create"]))
-        self._register_command(Command("set-default-agent", "Set default agent", ["default agent_name"], self.set_default_agent, ["default"]))
-        self._register_command(Command("chat", "Chat with agent", [], self.chat_session, ["talk"]))
-        self._register_command(Command("list-actions", "List actions for connection", ["list-actions conn"], self.list_actions, ["actions", "ls-actions"]))
-        self._register_command(Command("configure-connection", "Configure a connection", ["configure-connection conn"], self.configure_connection, ["config", "setup"]))
-        self._register_command(Command("list-connections", "List all connections", [], self.list_connections, ["connections", "ls-connections"]))
-        self._register_command(Command("exit", "Exit CLI", ["exit"], self.exit, ["quit", "q"]))
+        self.aliases: Dict[str, str] = {}
+        for name, description, tips, handler_name, aliases in self._COMMAND_SPECS:
+            self._register_command(Command(name, description, tips, getattr(self, handler_name), aliases))
+        self._command_keys = list(self.commands.keys())
 
     def _setup_prompt_toolkit(self):
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.completion import FuzzyCompleter, NestedCompleter, WordCompleter
+        from prompt_toolkit.styles import Style
+        from prompt_toolkit.history import FileHistory, ThreadedHistory
         self.style = Style.from_dict({
             'prompt': 'ansicyan bold',
             'command': 'ansigreen',
@@ -68,89 +119,126 @@ class ZerePyCLI:
             'warning': 'ansiyellow',
         })
         history_file = self.config_dir / 'history.txt'
-        self.completer = WordCompleter(list(self.commands.keys()), ignore_case=True, sentence=True)
-        self.session = PromptSession(completer=self.completer, style=self.style, history=FileHistory(str(history_file)))
+        agent_completer = WordCompleter(self._get_agent_names, ignore_case=True)
+        nested = {name: None for name in self._command_keys}
+        nested["help"] = WordCompleter(self._command_keys, ignore_case=True)
+        nested["load-agent"] = agent_completer
+        nested["set-default-agent"] = agent_completer
+        self.completer = FuzzyCompleter(NestedCompleter(nested, ignore_case=True), WORD=True)
+        self.session = PromptSession(completer=self.completer, style=self.style, history=ThreadedHistory(FileHistory(str(history_file))))
 
     def _register_command(self, command: Command):
-        self.commands[command.name] = command
+        name = sys.intern(command.name)
+        self.commands[name] = command
         for alias in command.aliases:
-            self.commands[alias] = command
+            self.aliases[sys.intern(alias)] = name
+
+    def _get_command(self, name: str) -> Optional[Command]:
+        return self.commands.get(name) or self.commands.get(self.aliases.get(name))
+
+    def _get_agent_names(self) -> List[str]:
+        try:
+            mtime_ns = os.stat("agents").st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if mtime_ns != self._agents_cache[0]:
+            with os.scandir("agents") as entries:
+                names = [
+                    entry.name[:-5] for entry in entries
+                    if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file()
+                ]
+            self._agents_cache = (mtime_ns, [name for name in names if name != "general"])
+        return self._agents_cache[1]
 
     def _get_prompt_message(self):
-        agent_status = f"({self.agent.name})" if self.agent else "(no agent)"
-        return HTML(f'<prompt>ZerePy-CLI</prompt> {agent_status} > ')
+        key = self.agent.name if self.agent else None
+        message = self._prompt_cache.get(key)
+        if message is None:
+            from prompt_toolkit.formatted_text import HTML
+            agent_status = f"({key})" if key else "(no agent)"
+            message = self._prompt_cache[key] = HTML(f'<prompt>ZerePy-CLI</prompt> {agent_status} > ')
+        return message
 
     def _handle_command(self, input_string: str):
+        if not input_string or input_string.isspace():
+            return
         try:
-            input_list = shlex.split(input_string)
+            input_list = _tokenize(input_string)
             if not input_list:
                 return
-            command_string = input_list[0].lower()
-            command = self.commands.get(command_string)
+            command_string = input_list[0]
+            if not command_string.islower():
+                command_string = command_string.lower()
+            command = self._get_command(command_string)
             if command:
                 command.handler(input_list)
             else:
                 self._handle_unknown_command(command_string)
         except Exception as e:
-            logger.error(f"Error: {e}")
+            logger.error("Error: %s", e)
 
     def _handle_unknown_command(self, command: str):
-        logger.warning(f"Unknown command: '{command}'")
+        logger.warning("Unknown command: '%s'", command)
         suggestions = self._get_command_suggestions(command)
         if suggestions:
             logger.info("Did you mean?")
             for s in suggestions:
-                logger.info(f"  - {s}")
+                logger.info("  - %s", s)
         logger.info("Use 'help' to see all commands.")
 
     def _get_command_suggestions(self, command: str, max_suggestions: int = 3):
-        from difflib import get_close_matches
-        return get_close_matches(command, self.commands.keys(), n=max_suggestions, cutoff=0.6)
+        if len(command) < 2:
+            return []
+        limit = min(3, max(2, len(command) // 2))
+        if process is None:
+            scored = ((_bounded_dl(command, key, limit), index, key) for index, key in enumerate(self._command_keys))
+            return [key for distance, _index, key in heapq.nsmallest(max_suggestions, scored) if distance <= limit]
+        matches = process.extract(command, self._command_keys, scorer=OSA.distance, score_cutoff=limit, limit=max_suggestions)
+        return [match for match, _score, _index in matches]
 
     def _print_welcome_message(self):
-        print_h_bar()
-        logger.info("👋 Welcome to the ZerePy CLI!")
-        logger.info("Type 'help' to list commands.")
-        print_h_bar()
+        sys.stdout.write(_WELCOME)
+        sys.stdout.flush()
 
     def _load_default_agent(self):
         try:
-            with open(Path("agents") / "general.json", "r") as f:
-                data = json.load(f)
+            data = _read_json_cached(Path("agents") / "general.json")
             default_agent = data.get("default_agent")
             if default_agent:
                 self._load_agent_from_file(default_agent)
             else:
                 logger.warning("No default agent set.")
         except Exception as e:
-            logger.warning(f"Failed to load default agent: {e}")
+            logger.warning("Failed to load default agent: %s", e)
 
     def _load_agent_from_file(self, agent_name):
+        self._prompt_cache.clear()
         try:
             self.agent = ZerePyAgent(agent_name)
-            logger.info(f"✅ Loaded agent: {self.agent.name}")
+            logger.info("✅ Loaded agent: %s", self.agent.name)
         except Exception as e:
-            logger.error(f"Could not load agent: {e}")
+            logger.error("Could not load agent: %s", e)
 
     def help(self, input_list: List[str]):
         if len(input_list) > 1:
-            cmd = self.commands.get(input_list[1])
+            cmd = self._get_command(input_list[1])
             if cmd:
-                logger.info(f"{cmd.name}: {cmd.description}")
-                for tip in cmd.tips:
-                    logger.info(f"  - {tip}")
+                lines = [f"{cmd.name}: {cmd.description}"]
+                lines.extend(f"  - {tip}" for tip in cmd.tips)
+                logger.info("\n".join(lines))
             else:
                 logger.warning("Command not found.")
         else:
-            logger.info("Commands:")
-            seen = set()
-            for cmd in self.commands.values():
-                if cmd.name not in seen:
-                    logger.info(f"  {cmd.name:<20} - {cmd.description}")
-                    seen.add(cmd.name)
+            lines = ["Commands:"]
+            lines.extend(f"  {cmd.name:<20} - {cmd.description}" for cmd in self.commands.values())
+            logger.info("\n".join(lines))
 
     def clear_screen(self, input_list: List[str]):
-        os.system("cls" if os.name == "nt" else "clear")
+        if os.name == "nt":
+            os.system("cls")
+        else:
+            sys.stdout.write("\x1b[2J\x1b[H")
+            sys.stdout.flush()
         self._print_welcome_message()
 
     def agent_action(self, input_list: List[str]):
@@ -161,7 +249,7 @@ class ZerePyCLI:
             logger.info("Usage: agent-action <connection> <action>")
             return
         result = self.agent.perform_action(input_list[1], input_list[2], input_list[3:])
-        logger.info(f"Result: {result}")
+        logger.info("Result: %s", result)
 
     def agent_loop(self, input_list: List[str]):
         if not self.agent:
@@ -173,10 +261,8 @@ class ZerePyCLI:
             logger.info("Stopped.")
 
     def list_agents(self, input_list: List[str]):
-        agents = list(Path("agents").glob("*.json"))
-        for agent_file in agents:
-            if agent_file.stem != "general":
-                logger.info(f"- {agent_file.stem}")
+        for name in self._get_agent_names():
+            logger.info("- %s", name)
 
     def load_agent(self, input_list: List[str]):
         if len(input_list) < 2:
@@ -191,16 +277,22 @@ class ZerePyCLI:
         if len(input_list) < 2:
             logger.info("Usage: set-default-agent <agent_name>")
             return
+        import json
+        path = Path("agents") / "general.json"
+        tmp_path = path.with_suffix(".json.tmp")
         try:
-            path = Path("agents") / "general.json"
-            with open(path, "r") as f:
-                data = json.load(f)
+            data = dict(_read_json_cached(path))
             data["default_agent"] = input_list[1]
-            with open(path, "w") as f:
+            with open(tmp_path, "w") as f:
                 json.dump(data, f, indent=4)
-            logger.info(f"Default agent set to {input_list[1]}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            _json_cache[path] = (os.stat(path).st_mtime_ns, data)
+            logger.info("Default agent set to %s", input_list[1])
         except Exception as e:
-            logger.error(f"Error updating default agent: {e}")
+            tmp_path.unlink(missing_ok=True)
+            logger.error("Error updating default agent: %s", e)
 
     def list_actions(self, input_list: List[str]):
         if not self.agent:
@@ -233,15 +325,16 @@ class ZerePyCLI:
         if not self.agent.is_llm_set:
             self.agent._setup_llm_provider()
         print_h_bar()
-        logger.info(f"Chatting with {self.agent.name}")
+        logger.info("Chatting with %s", self.agent.name)
         print_h_bar()
+        info = self._info
         while True:
             try:
                 message = self.session.prompt("\nYou: ")
                 if message.strip().lower() == "exit":
                     break
                 response = self.agent.prompt_llm(message)
-                logger.info(f"{self.agent.name}: {response}")
+                info("%s: %s", self.agent.name, response)
                 print_h_bar()
             except KeyboardInterrupt:
                 break
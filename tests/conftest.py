@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Appended rather than prepended: src/types would otherwise shadow the stdlib module.
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+
+@pytest.fixture
+def cli(tmp_path, monkeypatch):
+    from zerepy.cli import ZerePyCLI
+
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    for name in ("general", "example", "eternalai-example", "starter"):
+        (agents / f"{name}.json").write_text("{}")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    return ZerePyCLI()
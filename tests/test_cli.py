@@ -0,0 +1,76 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from prompt_toolkit.document import Document
+
+from zerepy import cli as cli_module
+
+
+def _complete(cli, text):
+    return sorted(c.text for c in cli.completer.get_completions(Document(text), None))
+
+
+def test_completes_hyphenated_commands(cli):
+    assert _complete(cli, "list-a") == ["list-actions", "list-agents"]
+
+
+def test_completes_help_argument(cli):
+    assert _complete(cli, "help list-a") == ["list-actions", "list-agents"]
+
+
+def test_completes_agent_names(cli):
+    assert _complete(cli, "load-agent ex") == ["eternalai-example", "example"]
+
+
+@pytest.fixture(params=["rapidfuzz", "fallback"])
+def suggest(request, cli, monkeypatch):
+    if request.param == "rapidfuzz":
+        pytest.importorskip("rapidfuzz")
+    else:
+        monkeypatch.setattr(cli_module, "process", None)
+    return cli._get_command_suggestions
+
+
+@pytest.mark.parametrize("typo, expected", [
+    ("hlep", ["help"]),
+    ("he", ["help"]),
+    ("lod-agent", ["load-agent"]),
+    ("lst-agents", ["list-agents"]),
+    ("exti", ["exit"]),
+    ("hear", ["help", "clear"]),
+    ("load-aetgn", []),
+])
+def test_suggestions(suggest, typo, expected):
+    assert suggest(typo) == expected
+
+
+@pytest.mark.parametrize("typo", ["q", "xyz"])
+def test_no_suggestions_for_unrelated_input(suggest, typo):
+    assert suggest(typo) == []
+
+
+def test_agent_names_match_glob(cli, tmp_path):
+    (tmp_path / "agents" / ".hidden.json").write_text("{}")
+    (tmp_path / "agents" / "dir.json").mkdir()
+    (tmp_path / "agents" / "notes.txt").write_text("")
+    assert sorted(cli._get_agent_names()) == ["eternalai-example", "example", "starter"]
+
+
+def test_set_default_agent_writes_atomically(cli, tmp_path):
+    path = Path("agents") / "general.json"
+    cli._handle_command("set-default-agent x")
+    assert json.loads(path.read_text()) == {"default_agent": "x"}
+    assert cli_module._json_cache[path] == (os.stat(path).st_mtime_ns, {"default_agent": "x"})
+    assert not list((tmp_path / "agents").glob("*.tmp"))
+
+
+def test_set_default_agent_removes_tmp_on_failure(cli, tmp_path, monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cli_module.os, "replace", fail)
+    cli._handle_command("set-default-agent x")
+    assert json.loads((tmp_path / "agents" / "general.json").read_text()) == {}
+    assert not list((tmp_path / "agents").glob("*.tmp"))